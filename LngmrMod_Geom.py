@@ -8,10 +8,46 @@ Langmuir Reactor Model 1D and 2D
 
 from Constants import color_dict
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patch
+import math
 import numpy as np
 
+__all__ = ['Geom', 'RctMod2D', 'FeatMod2D', 'RctMod1D', 'Shape',
+           'Domain2D', 'Domain1D', 'Rectangle', 'Interval']
+
+_JRect = None
+
+def _get_jrect():
+    """
+    Build the Numba jitclass rectangle on first use.
+    
+    Numba is slow to import, so it is only loaded by to_typed_list().
+    """
+    global _JRect
+    if _JRect is not None:
+        return _JRect
+    from numba import float64, int32
+    from numba.experimental import jitclass
+
+    @jitclass([('blx', float64), ('bly', float64), ('trx', float64),
+               ('try_', float64), ('midx', int32)])
+    class JRect(object):
+        """Rectangle usable inside Numba nopython code."""
+        
+        def __init__(self, blx, bly, trx, try_, midx):
+            """Init corners and material number of the rectangle."""
+            self.blx = blx
+            self.bly = bly
+            self.trx = trx
+            self.try_ = try_
+            self.midx = midx
+        
+        def contains(self, x, y):
+            """Determine if (x, y) is inside, boundaries included."""
+            return self.blx <= x <= self.trx and self.bly <= y <= self.try_
+
+    _JRect = JRect
+    return _JRect
+
 class Geom(object):
     """Define all shared basic properties."""
     
@@ -26,6 +62,15 @@ class Geom(object):
         idomain: bool, var, whether domain is created
         mater_set: str, set of str, set of materials
         mater_dict: dict, map material to number
+        _n_mater: int, var, largest material number assigned so far
+        _blx, _bly: (M, ) array, bottom left of 2D shapes in sequence
+        _trx, _try: (M, ) array, top right of 2D shapes in sequence
+        _midx: (M, ) array, material number of 2D shapes in sequence
+        _nshape: int, var, number of 2D shapes stored in the arrays
+        _index: (res, res) array, shape number (1-based) covering each cell
+        _mixed: (res, res) array, whether a cell is cut by a shape edge
+        _bg_cache: tuple, (key, fig, axes, nseq, nsoa) of the last plot(),
+                   nseq/nsoa count shapes drawn from sequence/SoA arrays
         """
         self.name = name
         self.dim = 2
@@ -34,6 +79,17 @@ class Geom(object):
         self.has_domain = False
         self.mater_set = set()
         self.mater_dict = dict()
+        self._n_mater = 0
+        self._bg_cache = None
+        # shapes stored as structure-of-arrays, capacity grows by doubling
+        self._blx = np.empty(8, dtype=np.float64)
+        self._bly = np.empty(8, dtype=np.float64)
+        self._trx = np.empty(8, dtype=np.float64)
+        self._try = np.empty(8, dtype=np.float64)
+        self._midx = np.empty(8, dtype=np.int32)
+        self._nshape = 0
+        self._index = None
+        self._mixed = None
     
     def __str__(self):
         """Print out info."""
@@ -52,8 +108,10 @@ class Geom(object):
         """
         self.domain = domain
         self.mater_set.add(domain.mater)
-        self.mater_dict.update({domain.mater:0})
+        self.mater_dict[domain.mater] = 0
         self.has_domain = True
+        self._index = None
+        self._bg_cache = None
 
     def add_shape(self, shape):
         """
@@ -63,16 +121,38 @@ class Geom(object):
         """
         if self.has_domain:
             self.sequence.append(shape)
+            self._index = None
             if shape.mater in self.mater_set:
                 pass
             else:
                 self.mater_set.add(shape.mater)
-                self.mater_dict.update({shape.mater:(len(self.mater_set)-1)})
+                self._n_mater += 1
+                self.mater_dict[shape.mater] = self._n_mater
+            if shape.dim == 2:
+                self._append_soa(shape)
         else:
             res = 'Error: Domian is not created yet.'
             res += '\nRun self.create_domain() before self.add_shape()'
             return res
 
+    def _append_soa(self, shape):
+        """
+        Append a 2D shape to the structure-of-arrays.
+        
+        shape: class, Rectangle()
+        """
+        n = self._nshape
+        if n == len(self._midx):
+            self._blx = np.resize(self._blx, 2*n)
+            self._bly = np.resize(self._bly, 2*n)
+            self._trx = np.resize(self._trx, 2*n)
+            self._try = np.resize(self._try, 2*n)
+            self._midx = np.resize(self._midx, 2*n)
+        self._blx[n], self._bly[n] = shape._blx, shape._bly
+        self._trx[n], self._try[n] = shape._trx, shape._try
+        self._midx[n] = self.mater_dict[shape.mater]
+        self._nshape = n + 1
+
     def get_mater(self, posn):
         """
         Return the mater of a position.
@@ -80,6 +160,13 @@ class Geom(object):
         posn: unit in m, var or (2, ) array, position as input
         mater: str, var, material name
         """
+        if self._index is not None:
+            res = self._index.shape[0]
+            gx, gy = self._grid_coord(posn[0], posn[1], res)
+            ix, iy = math.floor(gx), math.floor(gy)
+            if 0 <= ix < res and 0 <= iy < res and not self._mixed[iy, ix]:
+                k = self._index[iy, ix]
+                return self.sequence[k-1].mater if k else 'Plasma'
         mater = 'Plasma'
         # To add domain check here
         for shape in self.sequence:
@@ -87,10 +174,138 @@ class Geom(object):
                 mater = shape.mater
         return mater
 
+    def _grid_coord(self, x, y, res):
+        """
+        Map a position to fractional cell coordinates of the index grid.
+        
+        Shared by build_index() and get_mater() so that shape edges and
+        query points are rounded the same way.
+        """
+        return ((x - self.domain._blx)/(self.domain.width/res),
+                (y - self.domain._bly)/(self.domain.height/res))
+
+    def build_index(self, res=64):
+        """
+        Build a uniform grid index over the 2D shapes for get_mater().
+        
+        res: int, var, number of cells along each side of the domain
+        Cells fully inside a shape store the number of the last such
+        shape. Cells cut by a shape edge are flagged as mixed and
+        queries there fall back to the exact shape test.
+        Call again after adding shapes, add_shape() drops the index.
+        """
+        if self.dim != 2:
+            return
+        # smallest unsigned dtype that holds every shape number
+        index = np.zeros((res, res), 
+                         dtype=np.min_scalar_type(len(self.sequence)))
+        mixed = np.zeros((res, res), dtype=bool)
+        clip = lambda i: min(max(i, 0), res)
+        for k, shape in enumerate(self.sequence, start=1):
+            if shape.dim != 2:
+                continue
+            bx, by = self._grid_coord(shape._blx, shape._bly, res)
+            tx, ty = self._grid_coord(shape._trx, shape._try, res)
+            # cells touched by the shape
+            i0, i1 = clip(math.floor(bx)), clip(math.floor(tx) + 1)
+            j0, j1 = clip(math.floor(by)), clip(math.floor(ty) + 1)
+            mixed[j0:j1, i0:i1] = True
+            # cells fully covered by the shape, the bottom left bound is
+            # exclusive since a point just below it may round onto it
+            i0, i1 = clip(math.floor(bx) + 1), clip(math.floor(tx))
+            j0, j1 = clip(math.floor(by) + 1), clip(math.floor(ty))
+            index[j0:j1, i0:i1] = k
+            mixed[j0:j1, i0:i1] = False
+        self._index = index
+        self._mixed = mixed
+
+    def to_soa(self):
+        """
+        Return the 2D shapes as structure-of-arrays.
+        
+        blx, bly, trx, try: unit in m, (M, ) float64 array, corners
+        midx: int32, (M, ) array, material number of each shape
+        """
+        n = self._nshape
+        return (self._blx[:n], self._bly[:n], self._trx[:n], self._try[:n],
+                self._midx[:n])
+
+    def to_typed_list(self):
+        """
+        Return the 2D shapes as a numba.typed.List of _JRect.
+        
+        Lets user @njit kernels loop over shapes in nopython mode.
+        Requires Numba, raises ImportError without it.
+        """
+        from numba.typed import List
+        jrect = _get_jrect()
+        # typed even when empty, so @njit kernels can still accept it
+        rects = List.empty_list(jrect.class_type.instance_type)
+        for blx, bly, trx, try_, midx in zip(*self.to_soa()):
+            rects.append(jrect(float(blx), float(bly), float(trx), 
+                               float(try_), int(midx)))
+        return rects
+
+    def build_palette(self):
+        """
+        Return the RGBA color of each material number.
+        
+        palette: (n_mater, 4) array, indexed by material number
+        """
+        from matplotlib import colors as mcolors
+        maters = sorted(self.mater_dict.items(), key=lambda kv: kv[1])
+        return np.array([mcolors.to_rgba(color_dict.get(n, 'none'))
+                         for _, n in maters])
+
+    def rasterize(self, npix=512):
+        """
+        Paint the 2D shapes into an image of material numbers.
+        
+        npix: int, var, number of pixels along the domain height
+        img: int32, (npix, W) array, material number of each pixel,
+        row 0 at the bottom of the domain, later shapes on top
+        Only for 2D geometry, returns None otherwise.
+        """
+        if self.dim != 2:
+            return
+        x0, y0 = self.domain._blx, self.domain._bly
+        nrow = npix
+        ncol = max(1, int(round(npix*self.domain.width/self.domain.height)))
+        px, py = self.domain.width/ncol, self.domain.height/nrow
+        img = np.zeros((nrow, ncol), dtype=self._midx.dtype)
+        for blx, bly, trx, try_, midx in zip(*self.to_soa()):
+            j0 = int(np.clip(round((blx - x0)/px), 0, ncol))
+            j1 = int(np.clip(round((trx - x0)/px), 0, ncol))
+            i0 = int(np.clip(round((bly - y0)/py), 0, nrow))
+            i1 = int(np.clip(round((try_ - y0)/py), 0, nrow))
+            img[i0:i1, j0:j1] = midx
+        return img
+
+    def get_mater_bulk(self, posns):
+        """
+        Return the material numbers of many positions at once.
+        
+        posns: unit in m, (N, 2) array, positions as input
+        matidx: int, (N, ) array, material number, 0 (domain) if no shape
+        later shapes overwrite earlier ones, same as get_mater()
+        """
+        posns = np.asarray(posns)
+        nshape = self._nshape
+        if not nshape:
+            return np.zeros(len(posns), dtype=int)
+        blx, bly, trx, try_, midx = self.to_soa()
+        x, y = posns[:, None, 0], posns[:, None, 1]
+        mask = (x >= blx) & (x <= trx) & (y >= bly) & (y <= try_)
+        # index of the last matching shape, -1 if none matches
+        idx = (mask * (np.arange(nshape) + 1)).max(axis=1) - 1
+        return np.where(idx >= 0, midx[idx], 0)
+
 
 class Shape():
     """Basic geometry element."""
     
+    __slots__ = ('label', 'mater', 'dim')
+    
     def __init__(self, label, mater, dim):
         """
         Define the common attributes.
@@ -106,6 +321,9 @@ class Shape():
 class Domain2D(Shape):
     """Define 2D domain."""
     
+    __slots__ = ('bl', 'tr', 'domain', 'width', 'height', 'type',
+                 '_blx', '_bly', '_trx', '_try')
+    
     def __init__(self, bl=(0.0, 0.0), domain=(1.0, 1.0)):
         """
         Define the init attributes.
@@ -119,12 +337,24 @@ class Domain2D(Shape):
         type: str, var, type of domain
         """
         super().__init__(label='A', mater='Plasma', dim=2)
-        self.bl = np.asarray(bl)
-        self.domain = np.asarray(domain)
-        self.tr = self.bl + self.domain
-        self.width, self.height = self.domain
+        self._blx, self._bly = float(bl[0]), float(bl[1])
+        self.width, self.height = float(domain[0]), float(domain[1])
+        self._trx, self._try = self._blx + self.width, self._bly + self.height
+        self.bl = (self._blx, self._bly)
+        self.domain = (self.width, self.height)
+        self.tr = (self._trx, self._try)
         self.type = 'Domain'
 
+    @property
+    def bl_arr(self):
+        """Return bottom left as (2, ) array."""
+        return np.asarray(self.bl)
+
+    @property
+    def tr_arr(self):
+        """Return top right as (2, ) array."""
+        return np.asarray(self.tr)
+
     def __contains__(self, posn):
         """
         Determind if a position is inside the Domain.
@@ -132,11 +362,25 @@ class Domain2D(Shape):
         posn: unit in m, (2, ) array, position as input
         boundaries are consindered as "Inside"
         """
-        return all(self.bl <= posn) and all(posn <= self.tr)
+        x, y = posn
+        return self._blx <= x <= self._trx and self._bly <= y <= self._try
+
+    def contains_points(self, posns):
+        """
+        Determine which positions are inside, for many at once.
+        
+        posns: unit in m, (N, 2) array, positions as input
+        return: bool, (N, ) array, boundaries are considered as "Inside"
+        """
+        x, y = posns[:, 0], posns[:, 1]
+        return ((x >= self._blx) & (x <= self._trx) & 
+                (y >= self._bly) & (y <= self._try))
 
 class Domain1D(Shape):
     """Define 1D domain."""
     
+    __slots__ = ('domain', 'type', '_left', '_right')
+    
     def __init__(self, domain=(0.0, 1.0)):
         """
         Define the init attributes.
@@ -148,7 +392,8 @@ class Domain1D(Shape):
         type: str, var, type of domain
         """
         super().__init__(label='A', mater='Plasma', dim=1)
-        self.domain = np.asarray(domain)
+        self._left, self._right = float(domain[0]), float(domain[1])
+        self.domain = (self._left, self._right)
         self.type = 'Domain'
 
     def __contains__(self, posn):
@@ -158,11 +403,23 @@ class Domain1D(Shape):
         posn: unit in m, (2, ) array, position as input
         boundaries are consindered as "Inside"
         """
-        return self.domain[0] <= posn <= self.domain[1]
+        return self._left <= posn <= self._right
+
+    def contains_points(self, posns):
+        """
+        Determine which positions are inside, for many at once.
+        
+        posns: unit in m, (N, ) array, positions as input
+        return: bool, (N, ) array, boundaries are considered as "Inside"
+        """
+        return (posns >= self._left) & (posns <= self._right)
 
 class Rectangle(Shape):
     """Rectangle is a 2D basic shape."""
     
+    __slots__ = ('bl', 'tr', 'width', 'height', 'type',
+                 '_blx', '_bly', '_trx', '_try')
+    
     def __init__(self, mater, bottom_left, top_right):
         """
         Init the Rectangle.
@@ -172,12 +429,24 @@ class Rectangle(Shape):
         type: str, var, type of Shape
         """
         super().__init__(label='A', mater=mater, dim=2)
-        self.bl = np.asarray(bottom_left)
-        self.tr = np.asarray(top_right)
-        self.width = self.tr[0] - self.bl[0]
-        self.height = self.tr[1] - self.bl[1]
+        self._blx, self._bly = float(bottom_left[0]), float(bottom_left[1])
+        self._trx, self._try = float(top_right[0]), float(top_right[1])
+        self.bl = (self._blx, self._bly)
+        self.tr = (self._trx, self._try)
+        self.width = self._trx - self._blx
+        self.height = self._try - self._bly
         self.type = 'Rectangle'
 
+    @property
+    def bl_arr(self):
+        """Return bottom left as (2, ) array."""
+        return np.asarray(self.bl)
+
+    @property
+    def tr_arr(self):
+        """Return top right as (2, ) array."""
+        return np.asarray(self.tr)
+
     def __contains__(self, posn):
         """
         Determind if a position is inside the Interval.
@@ -185,11 +454,25 @@ class Rectangle(Shape):
         posn: unit in m, (2, ) array, position as input
         boundaries are not consindered as "Inside"
         """
-        return all(self.bl <= posn) and all(posn <= self.tr)
+        x, y = posn
+        return self._blx <= x <= self._trx and self._bly <= y <= self._try
+
+    def contains_points(self, posns):
+        """
+        Determine which positions are inside, for many at once.
+        
+        posns: unit in m, (N, 2) array, positions as input
+        return: bool, (N, ) array, boundaries are considered as "Inside"
+        """
+        x, y = posns[:, 0], posns[:, 1]
+        return ((x >= self._blx) & (x <= self._trx) & 
+                (y >= self._bly) & (y <= self._try))
 
 class Interval(Shape):
     """Rectangle is a 1D basic shape."""
     
+    __slots__ = ('lr', 'length', '_left', '_right')
+    
     def __init__(self, mater, lr):
         """
         Init the Interval.
@@ -198,8 +481,14 @@ class Interval(Shape):
         mater: str, var, label of Interval.
         """
         super().__init__(label='A', mater=mater, dim=1)
-        self.lr = np.asarray(lr)
-        self.length = self.lr[1] - self.lr[0]
+        self._left, self._right = float(lr[0]), float(lr[1])
+        self.lr = (self._left, self._right)
+        self.length = self._right - self._left
+
+    @property
+    def lr_arr(self):
+        """Return left and right as (2, ) array."""
+        return np.asarray(self.lr)
 
     def __contains__(self, posn):
         """
@@ -208,7 +497,16 @@ class Interval(Shape):
         posn: unit in m, (2, ) array, position as input
         boundaries are consindered as "Inside"
         """
-        return self.lr[0] <= posn <= self.lr[1]
+        return self._left <= posn <= self._right
+
+    def contains_points(self, posns):
+        """
+        Determine which positions are inside, for many at once.
+        
+        posns: unit in m, (N, ) array, positions as input
+        return: bool, (N, ) array, boundaries are considered as "Inside"
+        """
+        return (posns >= self._left) & (posns <= self._right)
 
 
 class RctMod2D(Geom):
@@ -221,49 +519,96 @@ class RctMod2D(Geom):
         res += f' x {self.domain.height} m'
         return super().__str__() + res
     
-    def plot(self, figsize=(8, 8), dpi=300, ihoriz=1):
+    def plot(self, figsize=(8, 8), dpi=100, ihoriz=1, mask_view=True,
+             raster=False):
         """
         Plot the geometry.
         
         figsize: unit in inch, (2, ) tuple, determine the fig/canvas size
-        dpi: dimless, int, Dots Per Inch
+        dpi: dimless, int, Dots Per Inch, use 300 for publication
+        mask_view: bool, var, whether to add the plasma/non-plasma view
+        raster: bool, var, draw shapes as one image instead of patches,
+                faster for geometries with many shapes
+        
+        Repeated calls with the same figsize, dpi, ihoriz and mask_view
+        reuse the previous figure and only draw the shapes added since.
         """ 
-        if ihoriz:
-            fig, axes = plt.subplots(1, 2, figsize=figsize, dpi=dpi,
-                                     constrained_layout=True)
+        from matplotlib import patches as patch
+        from matplotlib.collections import PatchCollection
+        from matplotlib.figure import Figure
+        
+        key = (tuple(figsize), dpi, ihoriz, mask_view)
+        if raster or self._bg_cache is None or self._bg_cache[0] != key:
+            # figures made without pyplot need no plt.close()
+            fig = Figure(figsize=figsize, dpi=dpi, constrained_layout=True)
+            if not mask_view:
+                axes = [fig.subplots(1, 1)]
+            elif ihoriz:
+                axes = fig.subplots(1, 2)
+            else:
+                axes = fig.subplots(2, 1)
+            nseq = None
         else:
-            fig, axes = plt.subplots(2, 1, figsize=figsize, dpi=dpi,
-                                     constrained_layout=True)
-        
-        ax = axes[0]
-        temp_col = color_dict[self.mater_dict[self.domain.mater]]
-        ax.add_patch(
-            patch.Rectangle(self.domain.bl, self.domain.width, self.domain.height,
-                            facecolor='w'))
-        for shape in self.sequence:
-            
-                
-            if shape.type == 'Rectangle':
-                
-                temp_col = color_dict[self.mater_dict[shape.mater]]
-                ax.add_patch(
-                    patch.Rectangle(shape.bl, shape.width, shape.height,
-                                    facecolor=temp_col))
-                
-        ax = axes[1]
-        ax.add_patch(
-            patch.Rectangle(self.domain.bl, self.domain.width, self.domain.height,
-                            facecolor='purple'))
-        for shape in self.sequence:
-            if shape.type == 'Rectangle':
-                ax.add_patch(
-                    patch.Rectangle(shape.bl, shape.width, shape.height,
-                                    facecolor='w', edgecolor='w'))
+            _, fig, axes, nseq, nsoa = self._bg_cache
+        
+        if raster:
+            self._plot_raster(axes, mask_view)
+            fig.savefig(self.name, dpi=dpi, pil_kwargs={'compress_level': 1})
+            return
+        
+        if nseq is None:
+            # static background, drawn once per cached figure
+            axes[0].add_patch(
+                patch.Rectangle(self.domain.bl, self.domain.width, 
+                                self.domain.height, facecolor='w'))
+            if mask_view:
+                axes[1].add_patch(
+                    patch.Rectangle(self.domain.bl, self.domain.width, 
+                                    self.domain.height, facecolor='purple'))
+            for ax in axes:
+                ax.set_xlim(self.domain.bl[0], self.domain.tr[0])
+                ax.set_ylim(self.domain.bl[1], self.domain.tr[1])
+            nseq, nsoa = 0, 0
+        
+        # draw the new rectangles of each axes as one collection
+        # only 2D shapes enter the SoA arrays, so filter on the same test
+        rects = [shape for shape in self.sequence[nseq:] if shape.dim == 2]
+        if rects:
+            colors = self.build_palette()[self.to_soa()[4][nsoa:]]
+            axes[0].add_collection(PatchCollection(
+                [patch.Rectangle(shape.bl, shape.width, shape.height)
+                 for shape in rects],
+                facecolors=colors, edgecolors='none'))
+            if mask_view:
+                axes[1].add_collection(PatchCollection(
+                    [patch.Rectangle(shape.bl, shape.width, shape.height)
+                     for shape in rects],
+                    facecolors='w', edgecolors='w'))
+        self._bg_cache = (key, fig, axes, len(self.sequence), self._nshape)
+        fig.savefig(self.name, dpi=dpi, pil_kwargs={'compress_level': 1})
+
+    def _plot_raster(self, axes, mask_view):
+        """
+        Draw the geometry as images of material numbers.
+        
+        axes: list of matplotlib Axes, as created in plot()
+        mask_view: bool, var, whether axes[1] holds the mask view
+        """
+        from matplotlib import colors as mcolors
+        img = self.rasterize()
+        extent = [self.domain.bl[0], self.domain.tr[0],
+                  self.domain.bl[1], self.domain.tr[1]]
+        axes[0].imshow(self.build_palette()[img], origin='lower',
+                       extent=extent, interpolation='nearest', aspect='auto')
+        if mask_view:
+            mask = np.array([mcolors.to_rgba('purple'), 
+                             mcolors.to_rgba('w')])
+            axes[1].imshow(mask[(img > 0).astype(int)], origin='lower',
+                           extent=extent, interpolation='nearest', 
+                           aspect='auto')
         for ax in axes:
             ax.set_xlim(self.domain.bl[0], self.domain.tr[0])
             ax.set_ylim(self.domain.bl[1], self.domain.tr[1])
-        fig.savefig(self.name, dpi=dpi)
-        plt.close()
 
 class FeatMod2D(RctMod2D):
     """Define the geometry for 2D Feature Model."""
@@ -285,30 +630,36 @@ class RctMod1D(Geom):
         res += f'\nwith domain {self.domain.domain} m'
         return super().__str__() + res
     
-    def plot(self, figsize=(8, 8), dpi=300):
+    def plot(self, figsize=(8, 8), dpi=100):
         """
         Plot the 1D geometry.
         
         figsize: unit in inch, (2, ) tuple, determine the fig/canvas size
-        dpi: dimless, int, Dots Per Inch
+        dpi: dimless, int, Dots Per Inch, use 300 for publication
         """
-        fig, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi,
-                               constrained_layout=True)
+        from matplotlib.figure import Figure
+        # figures made without pyplot leave the user's backend alone
+        fig = Figure(figsize=figsize, dpi=dpi, constrained_layout=True)
+        ax = fig.subplots(1, 1)
         ax.plot(self.domain.domain, (0.0, 0.0), 'o-',
                 linewidth=5, color='purple', markersize=16)
-        for segment in self.sequence:
-            temp_col = color_dict[self.mater_dict[segment.mater]]
-            ax.plot(segment.lr, (0.0, 0.0), 'o-',
-                linewidth=5, color=temp_col, markersize=16)
-        fig.savefig(self.name, dpi=dpi)
-        plt.close()
+        # all segments lie on one row, draw them in two collections
+        if self.sequence:
+            lefts = [segment.lr[0] for segment in self.sequence]
+            rights = [segment.lr[1] for segment in self.sequence]
+            colors = self.build_palette()[
+                [self.mater_dict[segment.mater] for segment in self.sequence]]
+            ax.hlines([0.0]*len(colors), lefts, rights, colors=colors, 
+                      linewidth=5)
+            ax.scatter(lefts + rights, [0.0]*(2*len(colors)), 
+                       c=np.concatenate((colors, colors)), s=16**2, zorder=2)
+        fig.savefig(self.name, dpi=dpi, pil_kwargs={'compress_level': 1})
 
 
 if __name__ == '__main__':
-    import os
-    import glob
-    for i in glob.glob("*.png"):
-        os.remove(i)
+    from pathlib import Path
+    for png in Path('.').glob('*.png'):
+        png.unlink(missing_ok=True)
 
     # build the geometry
     ICP2d = RctMod2D(name='ICP2D', is_cyl=False)
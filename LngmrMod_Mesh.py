@@ -6,7 +6,48 @@ Create mesh for a given geometry.
 
 import numpy as np
 from copy import deepcopy
-import matplotlib.pyplot as plt
+
+__all__ = ['Mesh', 'Mesh2D', 'Mesh1D']
+
+# points x shapes above which the Numba kernel replaces get_mater_bulk(),
+# whose (N, M) temporaries take about 20 bytes per pair
+_NUMBA_MIN_WORK = 5_000_000
+_rasterize = None
+
+def _get_rasterize():
+    """
+    Compile the Numba rasterize kernel on first use.
+    
+    Return None if Numba is not installed.
+    """
+    global _rasterize
+    if _rasterize is not None:
+        return _rasterize
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True)
+    def rasterize(xs, ys, blx, bly, trx, try_, midx, out):
+        """
+        Assign the material number of the last shape containing each point.
+        
+        xs, ys: unit in m, (N, ) array, positions of points
+        blx, bly, trx, try_: unit in m, (M, ) array, corners of shapes
+        midx: int, (M, ) array, material number of shapes
+        out: (N, ) array, material number of points, 0 if no shape
+        """
+        for i in prange(xs.size):
+            m = 0
+            for k in range(blx.size):
+                if (blx[k] <= xs[i] <= trx[k] and 
+                    bly[k] <= ys[i] <= try_[k]):
+                    m = midx[k]
+            out[i] = m
+
+    _rasterize = rasterize
+    return _rasterize
 
 class Mesh():
     """Define all shared basic properties."""
@@ -61,11 +102,18 @@ class Mesh2D(Mesh):
 
     def _assign_mat(self):
         """Assign materials to nodes."""
-        for idx, x in np.ndenumerate(self.x):
-            z = self.z[idx]
-            posn = np.array([x, z])
-            mater = self.geom.get_mater(posn)
-            self.mat[idx] = self.geom.mater_dict[mater]
+        # small meshes are faster in NumPy than compiling/calling Numba
+        kernel = None
+        if self.x.size * self.geom._nshape >= _NUMBA_MIN_WORK:
+            kernel = _get_rasterize()
+        if kernel is not None:
+            out = np.zeros(self.x.size, dtype=np.int32)
+            kernel(self.x.ravel(), self.z.ravel(), *self.geom.to_soa(), out)
+            self.mat[:] = out.reshape(self.x.shape)
+        else:
+            posns = np.column_stack((self.x.ravel(), self.z.ravel()))
+            self.mat[:] = self.geom.get_mater_bulk(posns).reshape(
+                              self.x.shape)
     
     def _calc_plasma_area(self):
         """Calc the total area of plasma region."""
@@ -76,20 +124,20 @@ class Mesh2D(Mesh):
 
     def plot(self, figsize=(8, 8), dpi=600, ihoriz=1, s_size=5):
         """Plot mesh."""
-        colMap = plt.get_cmap('Set1')
+        from matplotlib.figure import Figure
+        colMap = 'Set1'
         
+        # figures made without pyplot leave the user's backend alone
+        fig = Figure(figsize=figsize, dpi=dpi, constrained_layout=True)
         if ihoriz:
-            fig, axes = plt.subplots(1, 2, figsize=figsize, dpi=dpi,
-                                     constrained_layout=True)
+            axes = fig.subplots(1, 2)
         else:
-            fig, axes = plt.subplots(2, 1, figsize=figsize, dpi=dpi,
-                                     constrained_layout=True)
+            axes = fig.subplots(2, 1)
         ax = axes[0]
         ax.scatter(self.x, self.z, c=self.mat, s=s_size, cmap=colMap)
         ax = axes[1]
         ax.scatter(self.x, self.z, c=self.bndy, s=s_size, cmap=colMap)
         fig.savefig(self.name, dpi=dpi)
-        plt.close()
 
     def cnt_diff(self, f):
         """
@@ -157,9 +205,11 @@ class Mesh1D(Mesh):
 
     def _assign_mat(self):
         """Assign materials to nodes."""
-        for idx, x in np.ndenumerate(self.x):
-            mater = self.geom.get_mater(x)
-            self.mat[idx] = self.geom.mater_dict[mater]
+        # loop over the few shapes instead of the many nodes,
+        # later shapes overwrite earlier ones as in get_mater()
+        for segment in self.geom.sequence:
+            mask = segment.contains_points(self.x)
+            self.mat[mask] = self.geom.mater_dict[segment.mater]
     
     def _calc_plasma_area(self):
         """Calc the total area of plasma region."""
@@ -170,21 +220,21 @@ class Mesh1D(Mesh):
 
     def plot(self, figsize=(8, 8), dpi=600, ihoriz=1):
         """Plot mesh."""
-        colMap = plt.get_cmap('Set1')
+        from matplotlib.figure import Figure
+        colMap = 'Set1'
         
-        fig, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi,
-                                 constrained_layout=True)
+        # figures made without pyplot leave the user's backend alone
+        fig = Figure(figsize=figsize, dpi=dpi, constrained_layout=True)
+        ax = fig.subplots(1, 1)
 
         ax.scatter(self.x, np.zeros_like(self.x), 
                    c=self.mat, s=10, cmap=colMap)
         fig.savefig(self.name, dpi=dpi)
-        plt.close()
 
 if __name__ == '__main__':
-    import os
-    import glob
-    for i in glob.glob("*.png"):
-        os.remove(i)
+    from pathlib import Path
+    for png in Path('.').glob('*.png'):
+        png.unlink(missing_ok=True)
 
     from LngmrMod_Geom import (RctMod2D, Domain2D, Rectangle,
                                RctMod1D, Domain1D, Interval)
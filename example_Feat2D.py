@@ -1,9 +1,8 @@
 """Examples."""
 
-import os
-import glob
-for i in glob.glob("*.png"):
-    os.remove(i)
+from pathlib import Path
+for png in Path('.').glob('*.png'):
+    png.unlink(missing_ok=True)
 
 from LngmrMod_Geom import RctMod2D, Domain2D, Rectangle
 from LngmrMod_Mesh import Mesh2D